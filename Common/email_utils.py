@@ -3,17 +3,77 @@ Email utility functions for the application
 Handles all email sending functionality including verification, password reset, etc.
 """
 
-from django.core.mail import send_mail, EmailMessage
+import time
+
+from django.core.mail import send_mail, EmailMessage, get_connection
 from django.conf import settings
 
 
-def send_verification_email(user_email, verification_token):
+def _send_with_retry(email, max_attempts=3, base_delay=1.0):
+    """
+    Send an EmailMessage, retrying transient failures with exponential backoff
+
+    SMTP providers occasionally refuse connections or throttle; retrying
+    with 1s/2s/4s... pauses rides out short outages without the caller
+    having to care. The last failure is re-raised so existing error
+    handling still sees it.
+
+    Args:
+        email: EmailMessage instance to send
+        max_attempts (int): Total attempts before giving up
+        base_delay (float): Seconds before the first retry; doubles each time
+
+    Returns:
+        bool: True once the message is sent
+    """
+    for attempt in range(1, max_attempts + 1):
+        try:
+            email.send(fail_silently=False)
+            return True
+        except Exception as e:
+            if attempt == max_attempts:
+                raise
+            delay = base_delay * (2 ** (attempt - 1))
+            print(
+                f"Email send failed (attempt {attempt}/{max_attempts}), "
+                f"retrying in {delay:.0f}s: {e}"
+            )
+            time.sleep(delay)
+
+
+def send_batch_emails(messages):
+    """
+    Send multiple EmailMessage objects over a single SMTP connection
+
+    Opening a connection per message is the dominant cost when notifying
+    many recipients (e.g. event-wide announcements); batching reuses one
+    connection for the whole list.
+
+    Args:
+        messages (list): EmailMessage instances ready to send
+
+    Returns:
+        int: Number of messages sent successfully
+    """
+    if not messages:
+        return 0
+
+    try:
+        with get_connection() as connection:
+            return connection.send_messages(messages) or 0
+    except Exception as e:
+        print(f"Error sending batch of {len(messages)} emails: {e}")
+        return 0
+
+
+def send_verification_email(user_email, verification_token, connection=None):
     """
     Send email verification link to user
 
     Args:
         user_email (str): User's email address
         verification_token (str): Verification token generated for the user
+        connection: Optional shared email connection to send over
 
     Returns:
         bool: True if email sent successfully, False otherwise
@@ -140,6 +200,7 @@ def send_verification_email(user_email, verification_token):
             recipient_list=[user_email],
             html_message=html_message,
             fail_silently=False,
+            connection=connection,
         )
         return True
     except Exception as e:
@@ -147,13 +208,14 @@ def send_verification_email(user_email, verification_token):
         return False
 
 
-def send_password_reset_email(user_email, reset_token):
+def send_password_reset_email(user_email, reset_token, connection=None):
     """
     Send password reset link to user
 
     Args:
         user_email (str): User's email address
         reset_token (str): Password reset token
+        connection: Optional shared email connection to send over
 
     Returns:
         bool: True if email sent successfully, False otherwise
@@ -266,6 +328,7 @@ def send_password_reset_email(user_email, reset_token):
             recipient_list=[user_email],
             html_message=html_message,
             fail_silently=False,
+            connection=connection,
         )
         return True
     except Exception as e:
@@ -273,13 +336,14 @@ def send_password_reset_email(user_email, reset_token):
         return False
 
 
-def send_welcome_email(user_email, user_name):
+def send_welcome_email(user_email, user_name, connection=None):
     """
     Send welcome email after successful email verification
 
     Args:
         user_email (str): User's email address
         user_name (str): User's name
+        connection: Optional shared email connection to send over
 
     Returns:
         bool: True if email sent successfully, False otherwise
@@ -380,6 +444,7 @@ def send_welcome_email(user_email, user_name):
             recipient_list=[user_email],
             html_message=html_message,
             fail_silently=False,
+            connection=connection,
         )
         return True
     except Exception as e:
@@ -387,7 +452,7 @@ def send_welcome_email(user_email, user_name):
         return False
 
 
-def send_order_confirmation_email(order):
+def send_order_confirmation_email(order, connection=None):
     """
     Send order confirmation email with ticket PDF attachments
 
@@ -399,6 +464,7 @@ def send_order_confirmation_email(order):
 
     Args:
         order: Order instance
+        connection: Optional shared email connection to send over
 
     Returns:
         bool: True if email sent successfully, False otherwise
@@ -413,9 +479,10 @@ def send_order_confirmation_email(order):
     subject = f"✓ Your Tickets for {order.event.title}! (Order #{order.order_number})"
 
     try:
-        # Generate ticket PDFs
+        # Generate ticket PDFs (reuse the grouped tickets for both the
+        # PDFs and the summary HTML so the order is only queried once)
         ticket_groups = group_tickets_by_type(order)
-        pdf_attachments = generate_order_ticket_pdfs(order)
+        pdf_attachments = generate_order_ticket_pdfs(order, groups=ticket_groups)
 
         # Generate summary table HTML
         summary_table = generate_summary_table_html(ticket_groups)
@@ -664,6 +731,7 @@ Phone: 1-800-EASYTICKET
             body=plain_message,
             from_email=settings.DEFAULT_FROM_EMAIL,
             to=[order.buyer_email],
+            connection=connection,
         )
 
         # Set HTML content
@@ -674,8 +742,9 @@ Phone: 1-800-EASYTICKET
         for filename, pdf_buffer in pdf_attachments:
             email.attach(filename, pdf_buffer.read(), "application/pdf")
 
-        # Send email
-        email.send(fail_silently=False)
+        # Send email (with backoff on transient SMTP failures — this is
+        # the one email the buyer must receive)
+        _send_with_retry(email)
 
         return True
 
@@ -687,12 +756,13 @@ Phone: 1-800-EASYTICKET
         return False
 
 
-def send_order_cancelled_email(order):
+def send_order_cancelled_email(order, connection=None):
     """
     Send order cancellation/refund email with inline HTML template
 
     Args:
         order: Order instance
+        connection: Optional shared email connection to send over
 
     Returns:
         bool: True if email sent successfully, False otherwise
@@ -795,6 +865,7 @@ If you have any questions, contact us at support@easyticket.com
             recipient_list=[order.buyer_email],
             html_message=html_message,
             fail_silently=False,
+            connection=connection,
         )
         return True
     except Exception as e:
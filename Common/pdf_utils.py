@@ -3,53 +3,94 @@ PDF generation utilities for EasyTicket
 Generates ticket PDFs with QR codes
 """
 
+import functools
+import hashlib
 import io
-import qrcode
-from datetime import datetime
+import os
+import segno
+from concurrent.futures import ProcessPoolExecutor
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Paragraph,
-    Spacer,
-    Image,
-    Table,
-    TableStyle,
-)
-from reportlab.lib import colors
 from reportlab.pdfgen import canvas
-from django.conf import settings
+from reportlab.graphics import renderPDF
+from reportlab.graphics.barcode.qr import QrCodeWidget
+from reportlab.graphics.shapes import Drawing
+from django.core.cache import cache
+
+# QR PNGs are immutable for a given payload, so cache them aggressively:
+# once in-process (LRU) and once in the shared Django cache so re-sends
+# and retries don't pay the encoding cost again.
+QR_CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
+
+# Static footer terms shown on every ticket page; built once at import
+# instead of per page
+TICKET_FOOTER_TERMS = (
+    "Please present this ticket (digital or printed) at the event entrance.",
+    "This ticket is valid for one entry only. QR code will be scanned upon entry.",
+    "No refunds or exchanges. For support, contact support@easyticket.com",
+)
 
 
-def generate_qr_code_image(qr_data):
+@functools.lru_cache(maxsize=1024)
+def _generate_qr_code_png(qr_data):
     """
-    Generate QR code image from data
+    Encode qr_data as a QR code and return the raw PNG bytes
+
+    segno writes the PNG itself, so no PIL Image object is ever built;
+    the PDF path skips rasterization entirely via QrCodeWidget
+    """
+    buffer = io.BytesIO()
+    # One pixel per module: ReportLab scales the image to the requested
+    # draw size anyway, so encoding a larger PNG is wasted work
+    segno.make(qr_data, error="h").save(buffer, kind="png", scale=1, border=2)
+    return buffer.getvalue()
+
+
+@functools.lru_cache(maxsize=256)
+def _format_event_date(event_date):
+    """
+    Format an event datetime for ticket pages, cached per datetime
+
+    Tickets in a group share the same event_date, so a whole PDF pays
+    the strftime cost once instead of once per page
+    """
+    return event_date.strftime("%B %d, %Y at %I:%M %p")
+
+
+def get_qr_png(qr_data):
+    """
+    Get QR code PNG bytes for the given data, using cached copies when available
+
+    Checks the in-process LRU cache first, then the shared cache backend,
+    and only generates a fresh PNG on a full miss.
 
     Args:
         qr_data (str): Data to encode in QR code
 
     Returns:
-        BytesIO: QR code image buffer
+        bytes: PNG image data
     """
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(qr_data)
-    qr.make(fit=True)
+    cache_key = f"qr:{hashlib.sha1(qr_data.encode()).hexdigest()}"
 
-    img = qr.make_image(fill_color="black", back_color="white")
+    png_bytes = cache.get(cache_key)
+    if png_bytes is None:
+        png_bytes = _generate_qr_code_png(qr_data)
+        cache.set(cache_key, png_bytes, QR_CACHE_TIMEOUT)
 
-    # Save to BytesIO buffer
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
-    buffer.seek(0)
+    return png_bytes
 
-    return buffer
+
+def generate_qr_code_image(qr_data):
+    """
+    Generate QR code image from data
+
+    Args:
+        qr_data (str): Data to encode in QR code
+
+    Returns:
+        BytesIO: QR code image buffer
+    """
+    return io.BytesIO(get_qr_png(qr_data))
 
 
 def generate_ticket_pdf_page(ticket, canvas_obj, page_width, page_height):
@@ -87,7 +128,7 @@ def generate_ticket_pdf_page(ticket, canvas_obj, page_width, page_height):
     y_pos -= 0.3 * inch
 
     # Event date and venue
-    event_date_str = ticket.event_date.strftime("%B %d, %Y at %I:%M %p")
+    event_date_str = _format_event_date(ticket.event_date)
     canvas_obj.drawCentredString(center_x, y_pos, event_date_str)
     y_pos -= 0.25 * inch
 
@@ -97,16 +138,20 @@ def generate_ticket_pdf_page(ticket, canvas_obj, page_width, page_height):
     y_pos -= 0.5 * inch
 
     # ========== QR CODE ==========
-    # Generate QR code
-    qr_buffer = generate_qr_code_image(ticket.qr_code_data)
-
-    # Create Image object and draw centered
+    # Draw the QR code as vector paths directly on the canvas (no raster
+    # round-trip through PNG)
     qr_size = 3 * inch
     qr_x = center_x - (qr_size / 2)
     y_pos -= qr_size
 
-    qr_image = Image(qr_buffer, width=qr_size, height=qr_size)
-    qr_image.drawOn(canvas_obj, qr_x, y_pos)
+    qr_widget = QrCodeWidget(ticket.qr_code_data, barLevel="H")
+    bounds = qr_widget.getBounds()
+    qr_scale = qr_size / (bounds[2] - bounds[0])
+    drawing = Drawing(
+        qr_size, qr_size, transform=[qr_scale, 0, 0, qr_scale, 0, 0]
+    )
+    drawing.add(qr_widget)
+    renderPDF.draw(drawing, canvas_obj, qr_x, y_pos)
 
     y_pos -= 0.5 * inch
 
@@ -132,13 +177,7 @@ def generate_ticket_pdf_page(ticket, canvas_obj, page_width, page_height):
     y_pos = margin + 0.5 * inch
     canvas_obj.setFont("Helvetica", 8)
 
-    terms = [
-        "Please present this ticket (digital or printed) at the event entrance.",
-        "This ticket is valid for one entry only. QR code will be scanned upon entry.",
-        "No refunds or exchanges. For support, contact support@easyticket.com",
-    ]
-
-    for term in terms:
+    for term in TICKET_FOOTER_TERMS:
         canvas_obj.drawCentredString(center_x, y_pos, term)
         y_pos -= 0.15 * inch
 
@@ -165,10 +204,10 @@ def group_tickets_by_type(order):
         ]
     """
     from Tickets.models import Ticket
-    from collections import defaultdict
 
-    # Get all tickets for this order
-    tickets = (
+    # Get all tickets for this order in a single query; materialize the
+    # queryset once so the render loops never go back to the database
+    tickets = list(
         Ticket.objects.filter(order_item__order=order)
         .select_related(
             "event",
@@ -181,70 +220,71 @@ def group_tickets_by_type(order):
         .order_by("event_date", "ticket_name", "tier_name", "day_name")
     )
 
-    # Group by (event_id, event_date, tier_name, day_name)
-    groups_dict = defaultdict(list)
+    # Group by (event_id, event_date, tier_name, day_name) in one pass,
+    # building the metadata (including filename) when a key is first seen
+    groups_dict = {}
 
     for ticket in tickets:
-        # Create unique key for grouping
+        tier_name = ticket.tier_name or ""
+        day_name = ticket.day_name or ""
         group_key = (
             str(ticket.event.id),
             ticket.event_date.date().isoformat(),
-            ticket.tier_name or "",
-            ticket.day_name or "",
+            tier_name,
+            day_name,
         )
-        groups_dict[group_key].append(ticket)
-
-    # Convert to list of dicts with metadata
-    groups = []
-    for (event_id, date_str, tier_name, day_name), ticket_list in groups_dict.items():
-        first_ticket = ticket_list[0]
-
-        # Generate smart filename
-        event_slug = (
-            first_ticket.event.slug
-            if hasattr(first_ticket.event, "slug")
-            else first_ticket.event.title.replace(" ", "_")
-        )
-        date_part = datetime.fromisoformat(date_str).strftime("%b%d")
-
-        filename_parts = [event_slug, date_part]
-        if tier_name:
-            filename_parts.append(tier_name.replace(" ", "_"))
-        if day_name:
-            filename_parts.append(day_name.replace(" ", "_"))
 
-        filename = f"{'_'.join(filename_parts)}.pdf"
-
-        groups.append(
-            {
-                "event": first_ticket.event,
-                "date": first_ticket.event_date,
+        group = groups_dict.get(group_key)
+        if group is None:
+            # Generate smart filename
+            event_slug = (
+                ticket.event.slug
+                if hasattr(ticket.event, "slug")
+                else ticket.event.title.replace(" ", "_")
+            )
+            filename_parts = [event_slug, ticket.event_date.strftime("%b%d")]
+            if tier_name:
+                filename_parts.append(tier_name.replace(" ", "_"))
+            if day_name:
+                filename_parts.append(day_name.replace(" ", "_"))
+
+            group = {
+                "event": ticket.event,
+                "date": ticket.event_date,
                 "tier_name": tier_name,
                 "day_name": day_name,
-                "ticket_type": first_ticket.ticket_name,
-                "tickets": ticket_list,
-                "filename": filename,
-                "quantity": len(ticket_list),
+                "ticket_type": ticket.ticket_name,
+                "tickets": [],
+                "filename": f"{'_'.join(filename_parts)}.pdf",
             }
-        )
+            groups_dict[group_key] = group
+
+        group["tickets"].append(ticket)
+
+    groups = list(groups_dict.values())
+    for group in groups:
+        group["quantity"] = len(group["tickets"])
 
     return groups
 
 
-def generate_grouped_ticket_pdf(ticket_group):
+def generate_grouped_ticket_pdf(ticket_group, output=None):
     """
     Generate a multi-page PDF for a group of tickets
     Each page = one ticket
 
     Args:
         ticket_group (dict): Dictionary with 'tickets' list and metadata
+        output: Optional writable file-like object (e.g. an open file or
+            an S3 upload stream). When given, the PDF is written straight
+            to it instead of being buffered in memory.
 
     Returns:
-        BytesIO: PDF file buffer
+        BytesIO: PDF file buffer, or `output` if one was provided
     """
-    buffer = io.BytesIO()
+    buffer = output if output is not None else io.BytesIO()
 
-    # Create PDF with ReportLab
+    # Create PDF with ReportLab (writes into the target on save())
     pdf = canvas.Canvas(buffer, pagesize=letter)
     page_width, page_height = letter
 
@@ -255,18 +295,24 @@ def generate_grouped_ticket_pdf(ticket_group):
 
     # Finalize PDF
     pdf.save()
-    buffer.seek(0)
 
+    if output is not None:
+        return output
+
+    buffer.seek(0)
     return buffer
 
 
-def generate_order_ticket_pdfs(order):
+def generate_order_ticket_pdfs(order, groups=None):
     """
     Generate all ticket PDFs for an order
     Groups tickets intelligently and creates separate PDFs
 
     Args:
         order: Order model instance
+        groups: Optional pre-built groups from group_tickets_by_type(),
+            to avoid re-running the ticket query when the caller already
+            grouped the order (e.g. for the email summary table)
 
     Returns:
         list: List of tuples (filename, pdf_buffer)
@@ -276,16 +322,24 @@ def generate_order_ticket_pdfs(order):
             ...
         ]
     """
-    # Group tickets
-    groups = group_tickets_by_type(order)
-
-    # Generate PDF for each group
-    pdf_attachments = []
-    for group in groups:
-        pdf_buffer = generate_grouped_ticket_pdf(group)
-        pdf_attachments.append((group["filename"], pdf_buffer))
-
-    return pdf_attachments
+    # Group tickets (unless the caller already did)
+    if groups is None:
+        groups = group_tickets_by_type(order)
+
+    # Rendering is CPU-bound (QR encoding + ReportLab), so fan groups out
+    # across processes when there's more than one. Each group carries
+    # fully prefetched tickets, so workers never touch the database.
+    if len(groups) > 1:
+        max_workers = min(len(groups), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pdf_buffers = list(executor.map(generate_grouped_ticket_pdf, groups))
+    else:
+        pdf_buffers = [generate_grouped_ticket_pdf(group) for group in groups]
+
+    return [
+        (group["filename"], pdf_buffer)
+        for group, pdf_buffer in zip(groups, pdf_buffers)
+    ]
 
 
 def generate_summary_table_html(ticket_groups):
@@ -298,7 +352,10 @@ def generate_summary_table_html(ticket_groups):
     Returns:
         str: HTML table
     """
-    table_html = """
+    # Collect fragments and join once at the end; repeated += on a long
+    # string re-copies the whole table for every row
+    parts = [
+        """
     <table style="width: 100%; border-collapse: collapse; margin: 20px 0;">
         <thead>
             <tr style="background-color: #4CAF50; color: white;">
@@ -310,6 +367,7 @@ def generate_summary_table_html(ticket_groups):
         </thead>
         <tbody>
     """
+    ]
 
     total_tickets = 0
     for group in ticket_groups:
@@ -320,7 +378,8 @@ def generate_summary_table_html(ticket_groups):
         if group["day_name"]:
             ticket_type += f" - {group['day_name']}"
 
-        table_html += f"""
+        parts.append(
+            f"""
             <tr>
                 <td style="padding: 10px; border: 1px solid #ddd;">{group['event'].title}</td>
                 <td style="padding: 10px; border: 1px solid #ddd;">{date_str}</td>
@@ -328,9 +387,11 @@ def generate_summary_table_html(ticket_groups):
                 <td style="padding: 10px; border: 1px solid #ddd; text-align: center;">{group['quantity']}</td>
             </tr>
         """
+        )
         total_tickets += group["quantity"]
 
-    table_html += f"""
+    parts.append(
+        f"""
         </tbody>
         <tfoot>
             <tr style="background-color: #f0f0f0; font-weight: bold;">
@@ -340,8 +401,9 @@ def generate_summary_table_html(ticket_groups):
         </tfoot>
     </table>
     """
+    )
 
-    return table_html
+    return "".join(parts)
 
 
 def generate_pdf_attachment_list_html(ticket_groups):
@@ -354,13 +416,15 @@ def generate_pdf_attachment_list_html(ticket_groups):
     Returns:
         str: HTML list
     """
-    html = "<ul style='list-style-type: none; padding: 0;'>"
+    parts = ["<ul style='list-style-type: none; padding: 0;'>"]
 
     for group in ticket_groups:
         ticket_count = group["quantity"]
         ticket_word = "ticket" if ticket_count == 1 else "tickets"
-        html += f"<li style='padding: 5px 0;'>📎 <strong>{group['filename']}</strong> (Contains {ticket_count} {ticket_word})</li>"
+        parts.append(
+            f"<li style='padding: 5px 0;'>📎 <strong>{group['filename']}</strong> (Contains {ticket_count} {ticket_word})</li>"
+        )
 
-    html += "</ul>"
+    parts.append("</ul>")
 
-    return html
+    return "".join(parts)
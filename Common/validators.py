@@ -7,6 +7,11 @@ import os
 from django.core.exceptions import ValidationError
 from django.utils.deconstruct import deconstructible
 
+# Compiled once at import; per-call re.compile/re.sub would re-check the
+# pattern cache on every validation
+PHONE_SEPARATOR_REGEX = re.compile(r"[\s\-\(\)]")
+PHONE_NUMBER_REGEX = re.compile(r"\+?1?\d{9,15}")
+
 
 @deconstructible
 class PhoneNumberValidator:
@@ -27,11 +32,10 @@ class PhoneNumberValidator:
             return
 
         # Remove spaces, dashes, parentheses
-        cleaned = re.sub(r"[\s\-\(\)]", "", value)
+        cleaned = PHONE_SEPARATOR_REGEX.sub("", value)
 
         # Validate format: optional +, then 9-15 digits
-        phone_regex = re.compile(r"^\+?1?\d{9,15}$")
-        if not phone_regex.match(cleaned):
+        if not PHONE_NUMBER_REGEX.fullmatch(cleaned):
             raise ValidationError(self.message, code=self.code)
 
 
@@ -76,13 +80,16 @@ class ImageExtensionValidator:
         if allowed_extensions is None:
             allowed_extensions = [".jpg", ".jpeg", ".png"]
         self.allowed_extensions = [ext.lower() for ext in allowed_extensions]
+        # Frozenset for O(1) membership checks; the list above keeps the
+        # original ordering for error messages and __eq__
+        self._allowed_set = frozenset(self.allowed_extensions)
 
     def __call__(self, image):
         if not image:
             return
 
         ext = os.path.splitext(image.name)[1].lower()
-        if ext not in self.allowed_extensions:
+        if ext not in self._allowed_set:
             raise ValidationError(
                 f"Unsupported file extension '{ext}'. "
                 f"Allowed extensions: {', '.join(self.allowed_extensions)}"
@@ -109,15 +116,8 @@ def validate_not_in_past(value):
         raise ValidationError("Date cannot be in the past")
 
 
-def validate_email_domain(value):
-    """
-    Validate email domain to prevent disposable email addresses
-    Add your own blacklist of disposable email domains
-    """
-    if not value:
-        return
-
-    disposable_domains = [
+DISPOSABLE_EMAIL_DOMAINS = frozenset(
+    [
         "tempmail.com",
         "throwaway.email",
         "guerrillamail.com",
@@ -126,9 +126,26 @@ def validate_email_domain(value):
         "trashmail.com",
         # Add more as needed
     ]
+)
+
+
+def validate_email_domain(value):
+    """
+    Validate email domain to prevent disposable email addresses
+    Add your own blacklist of disposable email domains
+    """
+    if not value:
+        return
 
     domain = value.split("@")[-1].lower()
-    if domain in disposable_domains:
-        raise ValidationError(
-            f"Email from domain '{domain}' is not allowed. Please use a valid email address."
-        )
+
+    # Walk the parent domains (a.b.c -> b.c) so subdomains of blocked
+    # hosts are caught too. Each step is an O(1) set lookup, which scales
+    # like a suffix-trie walk even if the blocklist grows to thousands of
+    # entries; the TLD on its own is never checked.
+    labels = domain.split(".")
+    for i in range(len(labels) - 1):
+        if ".".join(labels[i:]) in DISPOSABLE_EMAIL_DOMAINS:
+            raise ValidationError(
+                f"Email from domain '{domain}' is not allowed. Please use a valid email address."
+            )
@@ -7,6 +7,7 @@ from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.utils import timezone
+from django.utils.functional import cached_property
 from Common.validators import ImageSizeValidator, ImageExtensionValidator
 
 
@@ -185,8 +186,15 @@ class Event(models.Model):
 
             base_slug = slugify(self.title)
             slug = base_slug
+            # Fetch every colliding slug in one query instead of probing
+            # the database once per counter value
+            existing_slugs = set(
+                Event.objects.filter(slug__startswith=base_slug).values_list(
+                    "slug", flat=True
+                )
+            )
             counter = 1
-            while Event.objects.filter(slug=slug).exists():
+            while slug in existing_slugs:
                 slug = f"{base_slug}-{counter}"
                 counter += 1
             self.slug = slug
@@ -197,21 +205,31 @@ class Event(models.Model):
 
         super().save(*args, **kwargs)
 
+    @cached_property
+    def _now(self):
+        """
+        Reference time for the time-status properties
+
+        Cached per instance (model instances are request-scoped) so
+        serializers rendering is_upcoming/is_ongoing/is_past evaluate
+        timezone.now() once per event and see a consistent timestamp.
+        """
+        return timezone.now()
+
     @property
     def is_upcoming(self):
         """Check if event hasn't started yet"""
-        return self.start_date > timezone.now()
+        return self.start_date > self._now
 
     @property
     def is_ongoing(self):
         """Check if event is currently happening"""
-        now = timezone.now()
-        return self.start_date <= now <= self.end_date
+        return self.start_date <= self._now <= self.end_date
 
     @property
     def is_past(self):
         """Check if event has ended"""
-        return self.end_date < timezone.now()
+        return self.end_date < self._now
 
     @property
     def duration_days(self):
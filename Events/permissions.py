@@ -5,6 +5,24 @@ Custom permissions for Events app
 from rest_framework import permissions
 
 
+def _is_admin_user(request):
+    """
+    Check whether the requesting user is staff/admin, cached on the request
+
+    has_permission and has_object_permission can both run for the same
+    request (and per object in list contexts), so the user-type lookup is
+    resolved once and reused.
+    """
+    is_admin = getattr(request, "_cached_is_admin_user", None)
+    if is_admin is None:
+        user = request.user
+        is_admin = bool(
+            user and user.is_authenticated and (user.is_staff or user.user_type == "admin")
+        )
+        request._cached_is_admin_user = is_admin
+    return is_admin
+
+
 class IsOrganizer(permissions.BasePermission):
     """
     Permission to check if user is an organizer
@@ -29,7 +47,7 @@ class IsEventOwner(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Allow admin to access everything
-        if request.user.is_staff or request.user.user_type == "admin":
+        if _is_admin_user(request):
             return True
 
         # Check if user is the organizer of this event
@@ -56,7 +74,7 @@ class IsEventOwnerOrReadOnly(permissions.BasePermission):
             return True
 
         # Admin can modify anything
-        if request.user.is_staff or request.user.user_type == "admin":
+        if _is_admin_user(request):
             return True
 
         # Write permissions only for event owner
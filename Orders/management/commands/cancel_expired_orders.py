@@ -7,6 +7,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
 from Orders.models import Order
+from Orders.signals import process_order_status_change
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,16 +29,24 @@ class Command(BaseCommand):
         cutoff = timezone.now() - timedelta(minutes=minutes)
 
         # Find expired pending orders
-        expired_orders = Order.objects.filter(status="pending", created_at__lt=cutoff)
+        expired_orders = list(
+            Order.objects.filter(status="pending", created_at__lt=cutoff)
+        )
+
+        # One bulk UPDATE instead of a save() per order (each save would
+        # fire the pre/post_save signal pair), then dispatch the status
+        # transition once per order
+        Order.objects.filter(pk__in=[order.pk for order in expired_orders]).update(
+            status="cancelled",
+            cancellation_reason=(
+                f"Automatic cancellation - payment timeout ({minutes} minutes)"
+            ),
+            cancelled_at=timezone.now(),
+        )
 
         count = 0
         for order in expired_orders:
-            order.status = "cancelled"
-            order.cancellation_reason = (
-                f"Automatic cancellation - payment timeout ({minutes} minutes)"
-            )
-            order.cancelled_at = timezone.now()
-            order.save()
+            process_order_status_change(order, order.status, "cancelled")
             count += 1
             logger.info(
                 f"Auto-cancelled expired order: {order.order_number} "
@@ -179,29 +179,53 @@ class Order(models.Model):
     @property
     def total_tickets(self):
         """Get total number of tickets in order"""
+        # Querysets that went through setup_eager_loading carry this as
+        # a database annotation; fall back to summing the items
+        ticket_count = getattr(self, "ticket_count", None)
+        if ticket_count is not None:
+            return ticket_count
         return sum(item.quantity for item in self.items.all())
 
     def calculate_totals(self):
         """Recalculate order totals from items using consistent fee calculation"""
         from decimal import Decimal
         from django.conf import settings
+        from django.db import transaction
+        from django.db.models import Sum
+
+        with transaction.atomic():
+            # Lock this order row so concurrent recalculations (e.g. a
+            # promo application racing payment-intent creation) serialize
+            # and the discount cannot be applied twice
+            locked = Order.objects.select_for_update().get(pk=self.pk)
+            self.discount_amount = locked.discount_amount
+            self.promo_code = locked.promo_code
+
+            self.subtotal = self.items.aggregate(total=Sum("subtotal"))[
+                "total"
+            ] or Decimal("0.00")
+
+            # Use consistent service fee calculation from settings
+            fee_percentage = Decimal(
+                str(getattr(settings, "STRIPE_SERVICE_FEE_PERCENTAGE", 5.0))
+            )
+            self.service_fee = (
+                self.subtotal * fee_percentage / Decimal("100")
+            ).quantize(Decimal("0.01"))
 
-        items = self.items.all()
-        self.subtotal = sum(item.subtotal for item in items)
-
-        # Use consistent service fee calculation from settings
-        fee_percentage = Decimal(
-            str(getattr(settings, "STRIPE_SERVICE_FEE_PERCENTAGE", 5.0))
-        )
-        self.service_fee = (self.subtotal * fee_percentage / Decimal("100")).quantize(
-            Decimal("0.01")
-        )
+            # Apply discount if promo code is valid
+            # (This would be implemented with a PromoCode model)
 
-        # Apply discount if promo code is valid
-        # (This would be implemented with a PromoCode model)
+            self.total_amount = self.subtotal + self.service_fee - self.discount_amount
 
-        self.total_amount = self.subtotal + self.service_fee - self.discount_amount
-        self.save()
+            # Write just the totals in one UPDATE; a full save() would
+            # re-run the order-number/expiry logic and the status-change
+            # signals
+            Order.objects.filter(pk=self.pk).update(
+                subtotal=self.subtotal,
+                service_fee=self.service_fee,
+                total_amount=self.total_amount,
+            )
 
     def confirm_payment(self, payment_id=None, payment_method=None):
         """Mark order as confirmed after successful payment"""
@@ -211,14 +235,16 @@ class Order(models.Model):
             self.payment_id = payment_id
         if payment_method:
             self.payment_method = payment_method
-        self.save()
+        self.save(
+            update_fields=["status", "paid_at", "payment_id", "payment_method"]
+        )
 
     def cancel_order(self, reason=""):
         """Cancel the order"""
         self.status = "cancelled"
         self.cancelled_at = timezone.now()
         self.cancellation_reason = reason
-        self.save()
+        self.save(update_fields=["status", "cancelled_at", "cancellation_reason"])
 
 
 class OrderItem(models.Model):
@@ -3,6 +3,8 @@ Serializers for Orders app
 Handles order creation, validation, and payment processing
 """
 
+import uuid
+
 from rest_framework import serializers
 from django.db import transaction
 from django.utils import timezone
@@ -16,7 +18,18 @@ from Events.models import Event
 class OrderItemSerializer(serializers.ModelSerializer):
     """Serializer for OrderItem (read-only, for displaying order items)"""
 
-    full_ticket_name = serializers.CharField(read_only=True)
+    def to_representation(self, instance):
+        ret = super().to_representation(instance)
+        # Assemble from the snapshot values already in the output dict
+        # instead of routing through the model property, so large item
+        # lists skip a second round of per-field attribute resolution
+        name = ret["ticket_name"]
+        if ret["tier_name"]:
+            name = f"{name} - {ret['tier_name']}"
+        if ret["day_name"]:
+            name = f"{name} - {ret['day_name']}"
+        ret["full_ticket_name"] = name
+        return ret
 
     class Meta:
         model = OrderItem
@@ -32,7 +45,6 @@ class OrderItemSerializer(serializers.ModelSerializer):
             "ticket_name",
             "tier_name",
             "day_name",
-            "full_ticket_name",
             "created_at",
         ]
         read_only_fields = [
@@ -41,7 +53,6 @@ class OrderItemSerializer(serializers.ModelSerializer):
             "ticket_name",
             "tier_name",
             "day_name",
-            "full_ticket_name",
             "created_at",
         ]
 
@@ -55,6 +66,27 @@ class OrderItemCreateSerializer(serializers.Serializer):
     day_tier_price_id = serializers.UUIDField(required=False, allow_null=True)
     quantity = serializers.IntegerField(min_value=1)
 
+    def _lookup_related(self, model, map_name, object_id, ticket_type):
+        """
+        Resolve a tier/day-pass/day+tier id belonging to ticket_type
+
+        Uses the prefetched context map when nested under
+        OrderCreateSerializer; falls back to a direct query otherwise.
+        Returns None when the id is unknown or belongs to another
+        ticket type.
+        """
+        related_map = self.context.get(map_name)
+        if related_map is not None:
+            obj = related_map.get(str(object_id))
+            if obj is not None and obj.ticket_type_id == ticket_type.id:
+                return obj
+            return None
+
+        try:
+            return model.objects.get(id=object_id, ticket_type=ticket_type)
+        except model.DoesNotExist:
+            return None
+
     def validate(self, data):
         """
         Validate ticket availability and pricing
@@ -71,13 +103,21 @@ class OrderItemCreateSerializer(serializers.Serializer):
         day_pass_id = data.get("day_pass_id")
         quantity = data.get("quantity")
 
-        # Get ticket type for validation (locking will happen in create())
-        try:
-            ticket_type = TicketType.objects.select_related("event").get(
-                id=ticket_type_id
-            )
-        except TicketType.DoesNotExist:
-            raise serializers.ValidationError("Ticket type not found")
+        # Get ticket type for validation (locking will happen in create()).
+        # When nested under OrderCreateSerializer the types for all items
+        # were prefetched into the context in one query.
+        ticket_type_map = self.context.get("ticket_type_map")
+        if ticket_type_map is not None:
+            ticket_type = ticket_type_map.get(str(ticket_type_id))
+            if ticket_type is None:
+                raise serializers.ValidationError("Ticket type not found")
+        else:
+            try:
+                ticket_type = TicketType.objects.select_related("event").get(
+                    id=ticket_type_id
+                )
+            except TicketType.DoesNotExist:
+                raise serializers.ValidationError("Ticket type not found")
 
         # Check if ticket is on sale
         if not ticket_type.is_on_sale:
@@ -114,11 +154,10 @@ class OrderItemCreateSerializer(serializers.Serializer):
                     "This ticket type does not use day passes"
                 )
 
-            try:
-                tier = TicketTier.objects.get(
-                    id=ticket_tier_id, ticket_type=ticket_type
-                )
-            except TicketTier.DoesNotExist:
+            tier = self._lookup_related(
+                TicketTier, "ticket_tier_map", ticket_tier_id, ticket_type
+            )
+            if tier is None:
                 raise serializers.ValidationError("Invalid ticket tier")
 
             # Check tier quantity
@@ -140,9 +179,10 @@ class OrderItemCreateSerializer(serializers.Serializer):
             if ticket_tier_id:
                 raise serializers.ValidationError("This ticket type does not use tiers")
 
-            try:
-                day_pass = DayPass.objects.get(id=day_pass_id, ticket_type=ticket_type)
-            except DayPass.DoesNotExist:
+            day_pass = self._lookup_related(
+                DayPass, "day_pass_map", day_pass_id, ticket_type
+            )
+            if day_pass is None:
                 raise serializers.ValidationError("Invalid day pass")
 
             # Check day pass quantity
@@ -164,11 +204,10 @@ class OrderItemCreateSerializer(serializers.Serializer):
                     "Day+Tier price combination is required for this ticket type"
                 )
 
-            try:
-                day_tier_price = DayTierPrice.objects.get(
-                    id=day_tier_price_id, ticket_type=ticket_type
-                )
-            except DayTierPrice.DoesNotExist:
+            day_tier_price = self._lookup_related(
+                DayTierPrice, "day_tier_price_map", day_tier_price_id, ticket_type
+            )
+            if day_tier_price is None:
                 raise serializers.ValidationError("Invalid day+tier price combination")
 
             # Check if day_tier_price is on sale
@@ -228,6 +267,28 @@ class OrderDetailSerializer(serializers.ModelSerializer):
     """Detailed serializer for order details"""
 
     items = OrderItemSerializer(many=True, read_only=True)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Prefetch every relation this serializer renders, so serializing
+        a page of orders costs a fixed number of queries"""
+        from django.db.models import Prefetch, Sum
+        from django.db.models.functions import Coalesce
+
+        return (
+            queryset.select_related("event", "user")
+            .prefetch_related(
+                Prefetch(
+                    "items",
+                    queryset=OrderItem.objects.select_related(
+                        "ticket_type", "ticket_tier", "day_pass", "day_tier_price"
+                    ),
+                )
+            )
+            # total_tickets is served from this annotation instead of
+            # summing item quantities in Python per order
+            .annotate(ticket_count=Coalesce(Sum("items__quantity"), 0))
+        )
     event_name = serializers.CharField(source="event.title", read_only=True)
     event_image = serializers.ImageField(source="event.banner", read_only=True)
     event_date = serializers.DateTimeField(source="event.start_date", read_only=True)
@@ -297,6 +358,41 @@ class OrderCreateSerializer(serializers.ModelSerializer):
             "promo_code",
         ]
 
+    def to_internal_value(self, data):
+        """Prefetch the ticket records referenced by the items, one query
+        per model instead of one per item"""
+        items = data.get("items")
+        if isinstance(items, list):
+
+            def collect_ids(field):
+                ids = []
+                for item in items:
+                    if isinstance(item, dict):
+                        try:
+                            ids.append(uuid.UUID(str(item.get(field))))
+                        except (TypeError, ValueError):
+                            # Malformed ids are rejected by the item serializer
+                            continue
+                return ids
+
+            self.context["ticket_type_map"] = {
+                str(ticket_type.id): ticket_type
+                for ticket_type in TicketType.objects.select_related("event").filter(
+                    id__in=collect_ids("ticket_type_id")
+                )
+            }
+            for map_name, model, field in (
+                ("ticket_tier_map", TicketTier, "ticket_tier_id"),
+                ("day_pass_map", DayPass, "day_pass_id"),
+                ("day_tier_price_map", DayTierPrice, "day_tier_price_id"),
+            ):
+                self.context[map_name] = {
+                    str(obj.id): obj
+                    for obj in model.objects.filter(id__in=collect_ids(field))
+                }
+
+        return super().to_internal_value(data)
+
     def validate_items(self, items):
         """Ensure at least one item"""
         if not items:
@@ -363,11 +459,10 @@ class OrderCreateSerializer(serializers.ModelSerializer):
                         )
 
         # Calculate subtotal first before creating order
-        subtotal = Decimal("0.00")
-        for item_data in items_data:
-            unit_price = item_data["unit_price"]
-            quantity = item_data["quantity"]
-            subtotal += unit_price * quantity
+        subtotal = sum(
+            (d["unit_price"] * d["quantity"] for d in items_data),
+            Decimal("0.00"),
+        )
 
         # Create order with initial subtotal
         order = Order.objects.create(
@@ -377,23 +472,43 @@ class OrderCreateSerializer(serializers.ModelSerializer):
             **validated_data,
         )
 
-        # Create order items
+        # Create order items in a single bulk INSERT. bulk_create skips
+        # OrderItem.save(), so the subtotal and name snapshots are filled
+        # in here the same way save() would.
+        order_items = []
         for item_data in items_data:
             ticket_type = item_data["ticket_type"]
+            tier = item_data.get("tier")
+            day_pass = item_data.get("day_pass")
+            day_tier_price = item_data.get("day_tier_price")
             unit_price = item_data["unit_price"]
             quantity = item_data["quantity"]
 
-            # Create order item
-            OrderItem.objects.create(
-                order=order,
-                ticket_type=ticket_type,
-                ticket_tier=item_data.get("tier"),
-                day_pass=item_data.get("day_pass"),
-                day_tier_price=item_data.get("day_tier_price"),
-                quantity=quantity,
-                unit_price=unit_price,
+            if day_tier_price:
+                tier_name = day_tier_price.tier_name
+                day_name = day_tier_price.day_name
+            else:
+                tier_name = tier.name if tier else ""
+                day_name = day_pass.name if day_pass else ""
+
+            order_items.append(
+                OrderItem(
+                    order=order,
+                    ticket_type=ticket_type,
+                    ticket_tier=tier,
+                    day_pass=day_pass,
+                    day_tier_price=day_tier_price,
+                    quantity=quantity,
+                    unit_price=unit_price,
+                    subtotal=quantity * unit_price,
+                    ticket_name=ticket_type.name,
+                    tier_name=tier_name,
+                    day_name=day_name,
+                )
             )
 
+        OrderItem.objects.bulk_create(order_items)
+
         # Recalculate totals with fees
         order.calculate_totals()
 
@@ -3,27 +3,111 @@ Signals for Orders app
 Handles ticket inventory updates and ticket generation when orders are confirmed/cancelled
 """
 
+import hashlib
+import logging
+from datetime import datetime
+
 from django.db.models.signals import post_save, pre_save, pre_delete
+from django.db.models import Case, F, When
 from django.dispatch import receiver
 from django.db import transaction
-import logging
+from django.utils import timezone
 
+from Tickets.models import Ticket, TicketType, TicketTier, DayPass, DayTierPrice
 from .models import Order, OrderItem
 
 logger = logging.getLogger(__name__)
 
 
+def _collect_inventory_deltas(items, sign=1):
+    """
+    Sum per-row quantity_sold adjustments for an order's items
+
+    Returns one {pk: delta} dict per inventory model (TicketType,
+    TicketTier, DayPass, DayTierPrice). Works off the *_id attributes so
+    no related rows need to be fetched.
+    """
+    type_deltas = {}
+    tier_deltas = {}
+    day_deltas = {}
+    day_tier_deltas = {}
+
+    for item in items:
+        qty = sign * item.quantity
+        type_deltas[item.ticket_type_id] = (
+            type_deltas.get(item.ticket_type_id, 0) + qty
+        )
+
+        # day_tier_price takes precedence (tier_and_day pricing),
+        # otherwise adjust the individual tier and day_pass
+        if item.day_tier_price_id:
+            day_tier_deltas[item.day_tier_price_id] = (
+                day_tier_deltas.get(item.day_tier_price_id, 0) + qty
+            )
+        else:
+            if item.ticket_tier_id:
+                tier_deltas[item.ticket_tier_id] = (
+                    tier_deltas.get(item.ticket_tier_id, 0) + qty
+                )
+            if item.day_pass_id:
+                day_deltas[item.day_pass_id] = (
+                    day_deltas.get(item.day_pass_id, 0) + qty
+                )
+
+    return type_deltas, tier_deltas, day_deltas, day_tier_deltas
+
+
+def _bulk_adjust_quantity_sold(model, deltas):
+    """
+    Apply {pk: delta} quantity_sold adjustments in a single UPDATE
+
+    Uses a CASE WHEN expression so N inventory rows cost one query
+    instead of one UPDATE per row.
+    """
+    if not deltas:
+        return
+
+    model.objects.filter(pk__in=deltas).update(
+        quantity_sold=F("quantity_sold")
+        + Case(
+            *[When(pk=pk, then=delta) for pk, delta in deltas.items()],
+            default=0,
+        )
+    )
+
+
+def _apply_inventory_deltas(items, sign=1):
+    """Adjust quantity_sold for every inventory row touched by items"""
+    type_deltas, tier_deltas, day_deltas, day_tier_deltas = (
+        _collect_inventory_deltas(items, sign)
+    )
+    _bulk_adjust_quantity_sold(TicketType, type_deltas)
+    _bulk_adjust_quantity_sold(TicketTier, tier_deltas)
+    _bulk_adjust_quantity_sold(DayPass, day_deltas)
+    _bulk_adjust_quantity_sold(DayTierPrice, day_tier_deltas)
+
+
 @receiver(pre_save, sender=Order)
 def track_order_status_change(sender, instance, **kwargs):
     """
     Track the old status before saving to detect status changes
     """
+    # Saves that declare their columns and leave status alone (e.g. the
+    # webhook handlers' update_fields saves) cannot be a status change,
+    # so skip the SELECT entirely
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "status" not in update_fields:
+        instance._old_status = instance.status
+        return
+
     if instance.pk:  # Only for existing orders
-        try:
-            old_instance = Order.objects.get(pk=instance.pk)
-            instance._old_status = old_instance.status
-        except Order.DoesNotExist:
-            instance._old_status = None
+        # Only the status column is needed; fetching the full row here
+        # doubled the SELECT cost of every order save
+        instance._old_status = (
+            Order.objects.filter(pk=instance.pk)
+            .values_list("status", flat=True)
+            .first()
+        )
     else:
         instance._old_status = None
 
@@ -39,10 +123,25 @@ def update_ticket_inventory_on_order_save(sender, instance, created, **kwargs):
     if created:
         return
 
-    # Get old and new status
-    old_status = getattr(instance, "_old_status", None)
-    new_status = instance.status
+    # Mirror the pre_save short-circuit: a save that did not touch the
+    # status column has no inventory side effects
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and "status" not in update_fields:
+        return
+
+    process_order_status_change(
+        instance, getattr(instance, "_old_status", None), instance.status
+    )
 
+
+def process_order_status_change(instance, old_status, new_status):
+    """
+    Apply the inventory/ticket side effects of an order status change
+
+    Shared by the post_save receiver and bulk transition paths that
+    update orders with queryset.update() (which never fires signals) and
+    then dispatch here once per order.
+    """
     # Skip if no status change
     if old_status == new_status:
         return
@@ -50,107 +149,92 @@ def update_ticket_inventory_on_order_save(sender, instance, created, **kwargs):
     # If status changed to 'confirmed', increase sold quantities AND generate tickets
     if old_status != "confirmed" and new_status == "confirmed":
         with transaction.atomic():
-            # 1. Update inventory
-            for item in instance.items.select_related(
-                "ticket_type", "ticket_tier", "day_pass", "day_tier_price"
-            ).all():
-                # Update ticket type sold count using F() expression for atomic update
-                from django.db.models import F
-                from Tickets.models import TicketType, TicketTier, DayPass, DayTierPrice
-
-                TicketType.objects.filter(pk=item.ticket_type.pk).update(
-                    quantity_sold=F("quantity_sold") + item.quantity
+            # Fetch the items once; the same list feeds the inventory
+            # deltas and the ticket generation below. Only the columns
+            # actually read are selected — tickets reference the pricing
+            # rows by id, so the wide related rows are never loaded.
+            items = list(
+                instance.items.select_related("order__event").only(
+                    "quantity",
+                    "unit_price",
+                    "ticket_name",
+                    "tier_name",
+                    "day_name",
+                    "ticket_type",
+                    "ticket_tier",
+                    "day_pass",
+                    "day_tier_price",
+                    "order__event__start_date",
                 )
+            )
 
-                # Update day_tier_price sold count if applicable (for tier_and_day pricing)
-                if item.day_tier_price:
-                    DayTierPrice.objects.filter(pk=item.day_tier_price.pk).update(
-                        quantity_sold=F("quantity_sold") + item.quantity
-                    )
-                # Otherwise update individual tier and day_pass
-                else:
-                    # Update tier sold count if applicable
-                    if item.ticket_tier:
-                        TicketTier.objects.filter(pk=item.ticket_tier.pk).update(
-                            quantity_sold=F("quantity_sold") + item.quantity
-                        )
-
-                    # Update day pass sold count if applicable
-                    if item.day_pass:
-                        DayPass.objects.filter(pk=item.day_pass.pk).update(
-                            quantity_sold=F("quantity_sold") + item.quantity
-                        )
-
-            # 2. Generate individual tickets
-            from Tickets.models import Ticket
-
-            for item in instance.items.select_related(
-                "ticket_type",
-                "ticket_tier",
-                "day_pass",
-                "day_tier_price",
-                "order__event",
-            ).all():
+            # 1. Update inventory (one batched UPDATE per inventory model)
+            _apply_inventory_deltas(items)
+
+            # 2. Generate individual tickets in a single bulk INSERT.
+            # bulk_create skips Ticket.save(), so the auto-generated
+            # ticket_number and qr_code_data are filled in here the same
+            # way save() would.
+            date_str = datetime.now().strftime("%Y%m%d")
+            today_start = timezone.now().replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+            ticket_seq = Ticket.objects.filter(created_at__gte=today_start).count()
+
+            tickets = []
+            for item in items:
                 # Create individual ticket for each quantity
                 for i in range(item.quantity):
-                    Ticket.objects.create(
+                    ticket_seq += 1
+                    ticket = Ticket(
                         order_item=item,
                         event=item.order.event,
-                        ticket_type=item.ticket_type,
-                        ticket_tier=item.ticket_tier,
-                        day_pass=item.day_pass,
-                        day_tier_price=item.day_tier_price,
+                        ticket_type_id=item.ticket_type_id,
+                        ticket_tier_id=item.ticket_tier_id,
+                        day_pass_id=item.day_pass_id,
+                        day_tier_price_id=item.day_tier_price_id,
                         ticket_name=item.ticket_name,
                         tier_name=item.tier_name,
                         day_name=item.day_name,
                         event_date=item.order.event.start_date,
                         price=item.unit_price,
                         status="active",
+                        ticket_number=f"TKT-{date_str}-{ticket_seq:05d}",
+                    )
+                    secret = (
+                        f"{ticket.id}{ticket.ticket_number}"
+                        f"{timezone.now().isoformat()}"
                     )
+                    ticket.qr_code_data = hashlib.sha256(secret.encode()).hexdigest()
+                    tickets.append(ticket)
+
+            # Batching keeps the INSERT statements bounded for very large
+            # orders. Generating the rows fully inside the database
+            # (INSERT ... SELECT) would mean duplicating the UUID,
+            # ticket_number and QR-hash logic in SQL, so the rows stay in
+            # Python where the model owns that logic.
+            Ticket.objects.bulk_create(tickets, batch_size=500)
 
             logger.info(
-                f"Generated {instance.total_tickets} individual tickets for order {instance.order_number}"
+                f"Generated {len(tickets)} individual tickets for order {instance.order_number}"
             )
 
     # If status changed from 'confirmed' to 'cancelled'/'refunded', restore inventory AND cancel tickets
     elif old_status == "confirmed" and new_status in ["cancelled", "refunded"]:
         with transaction.atomic():
-            from django.db.models import F
-            from Tickets.models import (
-                TicketType,
-                TicketTier,
-                DayPass,
-                DayTierPrice,
-                Ticket,
+            # Restore inventory (one batched UPDATE per inventory model);
+            # the deltas only need the quantity and foreign key columns
+            _apply_inventory_deltas(
+                instance.items.only(
+                    "quantity",
+                    "ticket_type",
+                    "ticket_tier",
+                    "day_pass",
+                    "day_tier_price",
+                ),
+                sign=-1,
             )
 
-            for item in instance.items.select_related(
-                "ticket_type", "ticket_tier", "day_pass", "day_tier_price"
-            ).all():
-                # Restore ticket type quantity using F() expression
-                TicketType.objects.filter(pk=item.ticket_type.pk).update(
-                    quantity_sold=F("quantity_sold") - item.quantity
-                )
-
-                # Restore day_tier_price quantity if applicable
-                if item.day_tier_price:
-                    DayTierPrice.objects.filter(pk=item.day_tier_price.pk).update(
-                        quantity_sold=F("quantity_sold") - item.quantity
-                    )
-                # Otherwise restore individual tier and day_pass
-                else:
-                    # Restore tier quantity if applicable
-                    if item.ticket_tier:
-                        TicketTier.objects.filter(pk=item.ticket_tier.pk).update(
-                            quantity_sold=F("quantity_sold") - item.quantity
-                        )
-
-                    # Restore day pass quantity if applicable
-                    if item.day_pass:
-                        DayPass.objects.filter(pk=item.day_pass.pk).update(
-                            quantity_sold=F("quantity_sold") - item.quantity
-                        )
-
             # Cancel all tickets for this order
             cancelled_count = Ticket.objects.filter(
                 order_item__order=instance, status="active"
@@ -161,6 +245,22 @@ def update_ticket_inventory_on_order_save(sender, instance, created, **kwargs):
             )
 
 
+def restore_inventory_for_orders(queryset):
+    """
+    Restore inventory for every confirmed order in queryset
+
+    Aggregates the items of all matched orders into one set of deltas so
+    deleting K orders with M items costs at most one UPDATE per
+    inventory model instead of up to 3*K*M. Retention cleanup can call
+    this with the full queryset before a bulk delete(); the pre_delete
+    receiver routes single deletes through the same path.
+    """
+    items = OrderItem.objects.filter(
+        order__in=queryset.filter(status="confirmed")
+    ).only("quantity", "ticket_type", "ticket_tier", "day_pass", "day_tier_price")
+    _apply_inventory_deltas(items, sign=-1)
+
+
 @receiver(pre_delete, sender=Order)
 def restore_inventory_on_order_delete(sender, instance, **kwargs):
     """
@@ -168,32 +268,4 @@ def restore_inventory_on_order_delete(sender, instance, **kwargs):
     """
     if instance.status == "confirmed":
         with transaction.atomic():
-            from django.db.models import F
-            from Tickets.models import TicketType, TicketTier, DayPass, DayTierPrice
-
-            for item in instance.items.select_related(
-                "ticket_type", "ticket_tier", "day_pass", "day_tier_price"
-            ).all():
-                # Restore ticket type quantity using F() expression
-                TicketType.objects.filter(pk=item.ticket_type.pk).update(
-                    quantity_sold=F("quantity_sold") - item.quantity
-                )
-
-                # Restore day_tier_price quantity if applicable
-                if item.day_tier_price:
-                    DayTierPrice.objects.filter(pk=item.day_tier_price.pk).update(
-                        quantity_sold=F("quantity_sold") - item.quantity
-                    )
-                # Otherwise restore individual tier and day_pass
-                else:
-                    # Restore tier quantity if applicable
-                    if item.ticket_tier:
-                        TicketTier.objects.filter(pk=item.ticket_tier.pk).update(
-                            quantity_sold=F("quantity_sold") - item.quantity
-                        )
-
-                    # Restore day pass quantity if applicable
-                    if item.day_pass:
-                        DayPass.objects.filter(pk=item.day_pass.pk).update(
-                            quantity_sold=F("quantity_sold") - item.quantity
-                        )
+            restore_inventory_for_orders(Order.objects.filter(pk=instance.pk))
@@ -66,16 +66,12 @@ class OrderViewSet(viewsets.ModelViewSet):
 
         if user.is_staff:
             # Admins can see all orders
-            return Order.objects.select_related("user", "event").prefetch_related(
-                "items"
-            )
+            queryset = Order.objects.all()
+        else:
+            # Regular users see only their orders
+            queryset = Order.objects.filter(user=user)
 
-        # Regular users see only their orders
-        return (
-            Order.objects.filter(user=user)
-            .select_related("event")
-            .prefetch_related("items")
-        )
+        return OrderDetailSerializer.setup_eager_loading(queryset)
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action"""
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-08-26 16:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Events', '0003_event_pricing_type'),
+        ('Orders', '0004_orderitem_day_tier_price'),
+        ('Tickets', '0003_alter_ticket_day_pass_alter_ticket_ticket_tier_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['event_date', 'ticket_name', 'tier_name', 'day_name'], name='ticket_grouping_idx'),
+        ),
+    ]
@@ -503,6 +503,12 @@ class Ticket(models.Model):
             models.Index(fields=["qr_code_data"]),
             models.Index(fields=["event", "status"]),
             models.Index(fields=["order_item"]),
+            # Composite index matching the PDF grouping query's sort
+            # (filter on order_item, order by grouping key)
+            models.Index(
+                fields=["event_date", "ticket_name", "tier_name", "day_name"],
+                name="ticket_grouping_idx",
+            ),
         ]
 
     def __str__(self):